@@ -98,17 +98,19 @@ def handle_exception(exception: Exception, log_func=None) -> dict:
     """
     # Extract error code if available
     error_code = getattr(exception, 'error_code', 'UNKNOWN_ERROR')
+    message = str(exception)
+    exception_type = type(exception).__name__
     
     # Create standardized error response
     error_response = {
         'success': False,
         'error_code': error_code,
-        'message': str(exception),
-        'exception_type': type(exception).__name__
+        'message': message,
+        'exception_type': exception_type
     }
     
     # Log the exception if a logging function is provided
     if log_func:
-        log_func(f"Exception occurred: {type(exception).__name__} - {str(exception)} (Code: {error_code})")
+        log_func(f"Exception occurred: {exception_type} - {message} (Code: {error_code})")
     
     return error_response
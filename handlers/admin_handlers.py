@@ -6,26 +6,138 @@ Author: kkkredsv
 This module provides admin panel functionality and handlers for administrative operations.
 """
 
-from typing import Optional, Dict, List, Any
+import threading
+import time
+import weakref
+from array import array
+from collections import Counter, deque
+from functools import lru_cache
+from itertools import islice
+from typing import Optional, Dict, List, Any, Callable, Deque, Iterator, Mapping
 from datetime import datetime
-from enum import Enum
+from enum import IntEnum
 
 
-class AdminRole(Enum):
+# Timestamp format for log entries and stats
+_STRFTIME = "%Y-%m-%d %H:%M:%S"
+
+# Maximum number of log entries kept in memory
+MAX_LOGS = 10000
+
+# Last formatted log timestamp: (epoch second, formatted string), replaced as a whole
+_TS_CACHE = (-1, "")
+
+# Pending entries are emitted to log_func once this many accumulate...
+LOG_FLUSH_SIZE = 64
+
+# ...or once this many seconds have passed since the last flush. The interval
+# is only checked when the next entry is written; there is no background timer,
+# so call AdminPanel.flush() to emit entries left over after a burst.
+LOG_FLUSH_INTERVAL = 5
+
+
+class AdminRole(IntEnum):
     """Admin role levels"""
     SUPER_ADMIN = 3
     ADMIN = 2
     MODERATOR = 1
 
 
+# Role lookup by stored role value
+_ROLE_BY_VALUE = {role.value: role for role in AdminRole}
+
+# (value, name) pairs in declaration order, for stats output
+_ROLE_NAMES = [(role.value, role.name) for role in AdminRole]
+
+
+@lru_cache(maxsize=16)
+def _parse_role(role_str: str) -> Optional[AdminRole]:
+    """
+    Parse a case-insensitive role name
+    
+    Args:
+        role_str: Role name (SUPER_ADMIN, ADMIN, MODERATOR)
+        
+    Returns:
+        Matching AdminRole or None if the name is invalid
+    """
+    try:
+        return AdminRole[role_str.upper()]
+    except KeyError:
+        return None
+
+
+def _flush_pending(pending: List[str], log_func: Callable[[str], Any]) -> None:
+    """
+    Emit pending log entries to an external log sink as one batch
+    
+    Args:
+        pending: Pending log entries; cleared after emitting
+        log_func: External log sink
+    """
+    if not pending:
+        return
+    
+    batch = "\n".join(pending)
+    pending.clear()
+    log_func(batch)
+
+
+class _AdminsView(Mapping[int, Dict[str, Any]]):
+    """Read-only live mapping of admin ID to admin information"""
+    
+    def __init__(self, panel: "AdminPanel"):
+        """
+        Initialize the view
+        
+        Args:
+            panel: AdminPanel whose admins are exposed
+        """
+        self._panel = panel
+    
+    def __getitem__(self, admin_id: int) -> Dict[str, Any]:
+        admin = self._panel.get_admin(admin_id)
+        if admin is None:
+            raise KeyError(admin_id)
+        return admin
+    
+    def __contains__(self, admin_id: object) -> bool:
+        return admin_id in self._panel._id_to_index
+    
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._panel._id_to_index)
+    
+    def __len__(self) -> int:
+        return len(self._panel._id_to_index)
+
+
 class AdminPanel:
     """Main admin panel class for managing administrative operations"""
     
-    def __init__(self):
-        """Initialize the admin panel"""
-        self.admins: Dict[int, Dict[str, Any]] = {}
+    def __init__(self, log_func: Optional[Callable[[str], Any]] = None):
+        """
+        Initialize the admin panel
+        
+        Args:
+            log_func: Optional external log sink (e.g., logger.info); entries
+                are passed to it in newline-joined batches
+        """
+        # Admin fields are stored as parallel arrays, indexed via _id_to_index
+        self._ids: List[int] = []
+        self._usernames: List[str] = []
+        self._roles = array("b")
+        self._created_at: List[datetime] = []
+        self._last_action: List[Optional[Dict[str, Any]]] = []
+        self._id_to_index: Dict[int, int] = {}
         self.created_at = datetime.utcnow()
-        self.logs: List[str] = []
+        self.logs: Deque[str] = deque(maxlen=MAX_LOGS)
+        
+        self._log_func = log_func
+        self._pending: List[str] = []
+        self._last_flush = int(time.time())
+        if log_func:
+            # Emit leftovers on garbage collection or interpreter exit without keeping the panel alive
+            weakref.finalize(self, _flush_pending, self._pending, log_func)
     
     def add_admin(self, admin_id: int, username: str, role: AdminRole) -> bool:
         """
@@ -39,16 +151,16 @@ class AdminPanel:
         Returns:
             bool: True if admin was added successfully
         """
-        if admin_id in self.admins:
+        if admin_id in self._id_to_index:
             self._log(f"Admin {admin_id} already exists")
             return False
         
-        self.admins[admin_id] = {
-            "username": username,
-            "role": role,
-            "created_at": datetime.utcnow(),
-            "last_action": None
-        }
+        self._id_to_index[admin_id] = len(self._ids)
+        self._ids.append(admin_id)
+        self._usernames.append(username)
+        self._roles.append(role)
+        self._created_at.append(datetime.utcnow())
+        self._last_action.append(None)
         self._log(f"Admin {username} (ID: {admin_id}) added with role {role.name}")
         return True
     
@@ -62,15 +174,50 @@ class AdminPanel:
         Returns:
             bool: True if admin was removed successfully
         """
-        if admin_id not in self.admins:
+        index = self._id_to_index.pop(admin_id, None)
+        if index is None:
             self._log(f"Admin {admin_id} not found")
             return False
         
-        username = self.admins[admin_id]["username"]
-        del self.admins[admin_id]
+        username = self._usernames[index]
+        
+        # Move the last admin into the freed slot, then drop the tail
+        last = len(self._ids) - 1
+        if index != last:
+            moved_id = self._ids[last]
+            self._ids[index] = moved_id
+            self._usernames[index] = self._usernames[last]
+            self._roles[index] = self._roles[last]
+            self._created_at[index] = self._created_at[last]
+            self._last_action[index] = self._last_action[last]
+            self._id_to_index[moved_id] = index
+        
+        self._ids.pop()
+        self._usernames.pop()
+        self._roles.pop()
+        self._created_at.pop()
+        self._last_action.pop()
+        
         self._log(f"Admin {username} (ID: {admin_id}) removed")
         return True
     
+    def _admin_view(self, index: int) -> Dict[str, Any]:
+        """
+        Build the dictionary view of an admin
+        
+        Args:
+            index: Admin storage index
+            
+        Returns:
+            Dict containing admin information
+        """
+        return {
+            "username": self._usernames[index],
+            "role": _ROLE_BY_VALUE[self._roles[index]],
+            "created_at": self._created_at[index],
+            "last_action": self._last_action[index]
+        }
+    
     def get_admin(self, admin_id: int) -> Optional[Dict[str, Any]]:
         """
         Get admin information
@@ -81,16 +228,19 @@ class AdminPanel:
         Returns:
             Dict containing admin information or None if not found
         """
-        return self.admins.get(admin_id)
+        index = self._id_to_index.get(admin_id)
+        if index is None:
+            return None
+        return self._admin_view(index)
     
-    def get_all_admins(self) -> Dict[int, Dict[str, Any]]:
+    def get_all_admins(self) -> Mapping[int, Dict[str, Any]]:
         """
         Get all admin users
         
         Returns:
-            Dictionary of all admins
+            Read-only live mapping of all admins (admin info is built on access)
         """
-        return self.admins.copy()
+        return _AdminsView(self)
     
     def update_admin_role(self, admin_id: int, new_role: AdminRole) -> bool:
         """
@@ -103,12 +253,13 @@ class AdminPanel:
         Returns:
             bool: True if role was updated successfully
         """
-        if admin_id not in self.admins:
+        index = self._id_to_index.get(admin_id)
+        if index is None:
             self._log(f"Admin {admin_id} not found")
             return False
         
-        old_role = self.admins[admin_id]["role"].name
-        self.admins[admin_id]["role"] = new_role
+        old_role = _ROLE_BY_VALUE[self._roles[index]].name
+        self._roles[index] = new_role
         self._log(f"Admin {admin_id} role updated from {old_role} to {new_role.name}")
         return True
     
@@ -123,11 +274,12 @@ class AdminPanel:
         Returns:
             bool: True if action was recorded successfully
         """
-        if admin_id not in self.admins:
+        index = self._id_to_index.get(admin_id)
+        if index is None:
             self._log(f"Admin {admin_id} not found")
             return False
         
-        self.admins[admin_id]["last_action"] = {
+        self._last_action[index] = {
             "action": action,
             "timestamp": datetime.utcnow()
         }
@@ -142,11 +294,15 @@ class AdminPanel:
             limit: Maximum number of logs to return (None for all)
             
         Returns:
-            List of log entries
+            New list of log entries, safe for callers to mutate
+            (oldest entries beyond MAX_LOGS are dropped)
         """
         if limit:
-            return self.logs[-limit:]
-        return self.logs.copy()
+            # Walk from the right so only the requested tail is visited
+            tail = list(islice(reversed(self.logs), max(0, limit)))
+            tail.reverse()
+            return tail
+        return list(self.logs)
     
     def clear_logs(self) -> None:
         """Clear all admin panel logs"""
@@ -160,9 +316,32 @@ class AdminPanel:
         Args:
             message: Log message
         """
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        global _TS_CACHE
+        
+        # Entries have second granularity, so reuse the formatted timestamp
+        sec = int(time.time())
+        cached_sec, timestamp = _TS_CACHE
+        if sec != cached_sec:
+            timestamp = time.strftime(_STRFTIME, time.gmtime(sec))
+            _TS_CACHE = (sec, timestamp)
         log_entry = f"[{timestamp}] {message}"
         self.logs.append(log_entry)
+        
+        if self._log_func:
+            self._pending.append(log_entry)
+            if len(self._pending) >= LOG_FLUSH_SIZE or sec - self._last_flush >= LOG_FLUSH_INTERVAL:
+                self.flush()
+    
+    def flush(self) -> None:
+        """
+        Emit pending log entries to the external log sink
+        
+        Entries are otherwise flushed only from _log, once LOG_FLUSH_SIZE are
+        pending or LOG_FLUSH_INTERVAL has passed by the time of the next write.
+        """
+        self._last_flush = int(time.time())
+        if self._log_func:
+            _flush_pending(self._pending, self._log_func)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -171,14 +350,13 @@ class AdminPanel:
         Returns:
             Dictionary containing panel statistics
         """
-        role_counts = {role.name: 0 for role in AdminRole}
-        for admin in self.admins.values():
-            role_counts[admin["role"].name] += 1
+        counts = Counter(self._roles)
+        role_counts = {name: counts[value] for value, name in _ROLE_NAMES}
         
         return {
-            "total_admins": len(self.admins),
+            "total_admins": len(self._ids),
             "role_counts": role_counts,
-            "panel_created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "panel_created_at": self.created_at.strftime(_STRFTIME),
             "total_logs": len(self.logs)
         }
 
@@ -186,9 +364,14 @@ class AdminPanel:
 class AdminHandlers:
     """Handler class for admin operations"""
     
-    def __init__(self):
-        """Initialize admin handlers"""
-        self.panel = AdminPanel()
+    def __init__(self, log_func: Optional[Callable[[str], Any]] = None):
+        """
+        Initialize admin handlers
+        
+        Args:
+            log_func: Optional external log sink passed to the admin panel
+        """
+        self.panel = AdminPanel(log_func)
     
     def handle_admin_creation(self, admin_id: int, username: str, role: str) -> Dict[str, Any]:
         """
@@ -202,21 +385,20 @@ class AdminHandlers:
         Returns:
             Response dictionary
         """
-        try:
-            role_enum = AdminRole[role.upper()]
-            success = self.panel.add_admin(admin_id, username, role_enum)
-            
-            return {
-                "success": success,
-                "message": f"Admin {username} created successfully" if success else "Admin already exists",
-                "admin_id": admin_id
-            }
-        except KeyError:
+        role_enum = _parse_role(role)
+        if role_enum is None:
             return {
                 "success": False,
                 "message": f"Invalid role: {role}",
                 "admin_id": admin_id
             }
+        
+        success = self.panel.add_admin(admin_id, username, role_enum)
+        return {
+            "success": success,
+            "message": f"Admin {username} created successfully" if success else "Admin already exists",
+            "admin_id": admin_id
+        }
     
     def handle_admin_deletion(self, admin_id: int) -> Dict[str, Any]:
         """
@@ -246,22 +428,21 @@ class AdminHandlers:
         Returns:
             Response dictionary
         """
-        try:
-            role_enum = AdminRole[new_role.upper()]
-            success = self.panel.update_admin_role(admin_id, role_enum)
-            
-            return {
-                "success": success,
-                "message": f"Role updated to {new_role}" if success else "Admin not found",
-                "admin_id": admin_id,
-                "new_role": new_role
-            }
-        except KeyError:
+        role_enum = _parse_role(new_role)
+        if role_enum is None:
             return {
                 "success": False,
                 "message": f"Invalid role: {new_role}",
                 "admin_id": admin_id
             }
+        
+        success = self.panel.update_admin_role(admin_id, role_enum)
+        return {
+            "success": success,
+            "message": f"Role updated to {new_role}" if success else "Admin not found",
+            "admin_id": admin_id,
+            "new_role": new_role
+        }
     
     def handle_action_logging(self, admin_id: int, action: str) -> Dict[str, Any]:
         """
@@ -308,5 +489,25 @@ class AdminHandlers:
         }
 
 
-# Global admin handlers instance
-admin_handlers = AdminHandlers()
+# Guards lazy creation of the global admin handlers instance
+_admin_handlers_lock = threading.Lock()
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Lazily create the global admin handlers instance on first access
+    
+    Args:
+        name: Module attribute name
+        
+    Returns:
+        The requested module attribute
+    """
+    if name == "admin_handlers":
+        with _admin_handlers_lock:
+            # Another thread may have created it while we waited for the lock
+            instance = globals().get("admin_handlers")
+            if instance is None:
+                instance = globals()["admin_handlers"] = AdminHandlers()
+        return instance
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -6,14 +6,157 @@ Robokassa is a Russian payment aggregator that supports various payment methods.
 """
 
 import hashlib
-import requests
-from typing import Optional, Dict, Any
+import hmac
+import sys
+from functools import lru_cache, partial
+from typing import Optional, Dict, Any, Callable, Tuple
 from decimal import Decimal
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
+
+
+# MD5 constructor; usedforsecurity is only accepted from Python 3.9.
+# hashlib.md5 is already the OpenSSL-backed constructor, while hashlib.new
+# adds a by-name lookup on every call.
+if sys.version_info >= (3, 9):
+    _md5 = partial(hashlib.md5, usedforsecurity=False)
+else:
+    _md5 = hashlib.md5
+
+
+def _fmt_amount(amount: Decimal) -> str:
+    """
+    Format payment amount as Robokassa expects ("N.NN")
+    
+    Uses Decimal's C-level __format__, which is faster than scaling to
+    integer cents in Python and rounds the same way as before.
+    
+    Args:
+        amount: Payment amount
+        
+    Returns:
+        Amount with exactly 2 decimal places
+    """
+    return format(amount, ".2f")
+
+
+def _signature_digest(key: Tuple[bytes, str, str, str, Tuple[Tuple[str, str], ...]]) -> str:
+    """
+    Compute MD5 signature for a (login, amount, invoice, password, extras) key
+    
+    Each RobokassaPayment memoizes this by its full input tuple, since result
+    notifications are often retried for the same invoice.
+    
+    Args:
+        key: Encoded merchant login, formatted amount, invoice ID, password
+            and sorted extra parameter items
+            
+    Returns:
+        MD5 hex digest
+    """
+    merchant_login_bytes, amount_str, invoice_id, password, extra_items = key
+    
+    # Build signature payload: MerchantLogin:Sum:InvoiceID:Password[:key=value...]
+    parts = [merchant_login_bytes, amount_str.encode(), invoice_id.encode(), password.encode()]
+    for name, value in extra_items:
+        parts.append(f"{name}={value}".encode())
+    
+    return _md5(b":".join(parts)).hexdigest()
+
+
+def _fast_signature(prefix: bytes, amount_bytes: bytes, invoice_bytes: bytes, suffix: bytes) -> str:
+    """
+    Compute MD5 signature from a pre-encoded Login:<Sum>:<InvoiceID>:Password template
+    
+    Args:
+        prefix: Encoded merchant login followed by ":"
+        amount_bytes: Encoded formatted payment amount
+        invoice_bytes: Encoded invoice ID
+        suffix: ":" followed by the encoded password
+        
+    Returns:
+        MD5 hex digest
+    """
+    h = _md5()
+    h.update(prefix)
+    h.update(amount_bytes)
+    h.update(b":")
+    h.update(invoice_bytes)
+    h.update(suffix)
+    return h.hexdigest()
+
+
+def _build_query(
+    quoted_merchant_login: str,
+    amount_str: str,
+    invoice_id: str,
+    description: str,
+    signature: str,
+    is_test: bool,
+    email: Optional[str],
+    return_url: Optional[str],
+    extra_items: Tuple[Tuple[str, str], ...]
+) -> str:
+    """
+    Build payment URL query string with a fixed parameter layout
+    
+    Values are encoded like urlencode() does (str() then quote_plus),
+    without the generic dict walk. Extra parameters follow the fixed ones
+    in sorted order and never replace them.
+    
+    Args:
+        quoted_merchant_login: Merchant login, already URL-quoted
+        amount_str: Formatted payment amount
+        invoice_id: Invoice ID
+        description: Payment description
+        signature: Payment signature (hex digest, needs no quoting)
+        is_test: Whether test mode is enabled
+        email: Customer email
+        return_url: URL to redirect after payment
+        extra_items: Sorted extra parameter items
+        
+    Returns:
+        URL query string
+    """
+    query = (
+        f"MerchantLogin={quoted_merchant_login}&Sum={amount_str}"
+        f"&InvoiceID={quote_plus(invoice_id)}&Description={quote_plus(description)}"
+        f"&SignatureValue={signature}&IsTest={'1' if is_test else '0'}"
+    )
+    
+    if email:
+        query += f"&Email={quote_plus(email)}"
+    
+    if return_url:
+        query += f"&ReturnURL={quote_plus(return_url)}"
+    
+    if extra_items:
+        query += "&" + "&".join(
+            f"{quote_plus(str(name))}={quote_plus(str(value))}" for name, value in extra_items
+        )
+    
+    return query
 
 
 class RobokassaConfig:
-    """Configuration for Robokassa integration"""
+    """
+    Configuration for Robokassa integration
+    
+    Configurations are immutable, because processors precompute signature
+    templates and cache URLs from them. To rotate credentials, assign a
+    new RobokassaConfig to RobokassaPayment.config.
+    """
+    
+    __slots__ = (
+        "_merchant_login",
+        "_password1",
+        "_password2",
+        "_test_mode",
+        "_base_url",
+        "_api_url",
+        "_merchant_login_bytes",
+        "_quoted_merchant_login",
+        "_payment_url_prefix",
+    )
     
     def __init__(
         self,
@@ -31,13 +174,114 @@ class RobokassaConfig:
             password2: Second password (for result notification)
             test_mode: Enable test mode (default: False)
         """
-        self.merchant_login = merchant_login
-        self.password1 = password1
-        self.password2 = password2
-        self.test_mode = test_mode
+        self._merchant_login = sys.intern(merchant_login)
+        self._password1 = password1
+        self._password2 = password2
+        self._test_mode = test_mode
+        
+        self._base_url = "https://auth.robokassa.ru" if not test_mode else "https://test.robokassa.ru"
+        self._api_url = "https://api.robokassa.ru"
         
-        self.base_url = "https://auth.robokassa.ru" if not test_mode else "https://test.robokassa.ru"
-        self.api_url = "https://api.robokassa.ru"
+        # Derived values reused by every signature and payment URL
+        self._merchant_login_bytes = merchant_login.encode()
+        self._quoted_merchant_login = quote_plus(merchant_login)
+        self._payment_url_prefix = f"{self._base_url}/Merchant/Index?"
+    
+    @property
+    def merchant_login(self) -> str:
+        """Robokassa merchant login"""
+        return self._merchant_login
+    
+    @property
+    def password1(self) -> str:
+        """First password (for payment signature)"""
+        return self._password1
+    
+    @property
+    def password2(self) -> str:
+        """Second password (for result notification)"""
+        return self._password2
+    
+    @property
+    def test_mode(self) -> bool:
+        """Whether test mode is enabled"""
+        return self._test_mode
+    
+    @property
+    def base_url(self) -> str:
+        """Payment page base URL"""
+        return self._base_url
+    
+    @property
+    def api_url(self) -> str:
+        """API base URL"""
+        return self._api_url
+    
+    @property
+    def merchant_login_bytes(self) -> bytes:
+        """UTF-8 encoded merchant login"""
+        return self._merchant_login_bytes
+    
+    @property
+    def quoted_merchant_login(self) -> str:
+        """URL-quoted merchant login"""
+        return self._quoted_merchant_login
+    
+    @property
+    def payment_url_prefix(self) -> str:
+        """Payment URL up to the query string"""
+        return self._payment_url_prefix
+
+
+def _make_url_builder(
+    config: RobokassaConfig,
+    sig_prefix: bytes,
+    sig_suffix: bytes,
+    signature_cache: Callable[[Tuple[Any, ...]], str]
+) -> Callable[[Tuple[Any, ...]], str]:
+    """
+    Create a memoized payment URL builder bound to one configuration
+    
+    Checkout pages are refreshed and URL sends are retried with identical
+    arguments, so built URLs are memoized by their full input tuple. The
+    builder holds no reference to the processor that owns it.
+    
+    Args:
+        config: RobokassaConfig the URLs are built for
+        sig_prefix: Pre-encoded signature prefix (login and ":")
+        sig_suffix: Pre-encoded signature suffix (":" and password1)
+        signature_cache: Memoized _signature_digest for signatures with extras
+        
+    Returns:
+        Function mapping (invoice ID, formatted amount, description, email,
+        return URL, sorted extra parameter items) to the full payment URL
+    """
+    @lru_cache(maxsize=2048)
+    def build_url(key: Tuple[Any, ...]) -> str:
+        invoice_id, amount_str, description, email, return_url, extra_items = key
+        
+        if extra_items:
+            signature = signature_cache(
+                (config.merchant_login_bytes, amount_str, invoice_id, config.password1, extra_items)
+            )
+        else:
+            signature = _fast_signature(sig_prefix, amount_str.encode(), invoice_id.encode(), sig_suffix)
+        
+        query = _build_query(
+            config.quoted_merchant_login,
+            amount_str,
+            invoice_id,
+            description,
+            signature,
+            config.test_mode,
+            email,
+            return_url,
+            extra_items
+        )
+        
+        return config.payment_url_prefix + query
+    
+    return build_url
 
 
 class RobokassaPayment:
@@ -51,6 +295,58 @@ class RobokassaPayment:
             config: RobokassaConfig instance
         """
         self.config = config
+        
+        # Keep-alive API session, created on first API call
+        self._session = None
+    
+    @property
+    def config(self) -> RobokassaConfig:
+        """Current Robokassa configuration"""
+        return self._config
+    
+    @config.setter
+    def config(self, config: RobokassaConfig) -> None:
+        self._config = config
+        
+        # Pre-encoded signature template: Login:<Sum>:<InvoiceID>:Password
+        self._sig_prefix = config.merchant_login_bytes + b":"
+        self._sig_suffix_p1 = b":" + config.password1.encode()
+        self._sig_suffix_p2 = b":" + config.password2.encode()
+        
+        # Fresh caches, so entries for the previous credentials are dropped
+        self._signature_cache = lru_cache(maxsize=4096)(_signature_digest)
+        self._build_url = _make_url_builder(
+            config, self._sig_prefix, self._sig_suffix_p1, self._signature_cache
+        )
+    
+    def _get_session(self):
+        """
+        Get the pooled API session, creating it on first use
+        
+        requests is imported here so that generating payment URLs and
+        verifying signatures does not pay its import cost.
+        
+        Returns:
+            requests.Session with keep-alive connection pooling
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+            
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=32,
+                max_retries=Retry(total=2, backoff_factor=0.2)
+            ))
+            self._session = session
+        return self._session
+    
+    def invalidate_cache(self) -> None:
+        """Clear this processor's memoized signatures and payment URLs"""
+        self._signature_cache.cache_clear()
+        self._build_url.cache_clear()
     
     def _generate_signature(
         self,
@@ -73,22 +369,38 @@ class RobokassaPayment:
         Returns:
             MD5 hash signature
         """
-        # Format amount with 2 decimal places
-        amount_str = f"{sum_amount:.2f}"
+        amount_str = _fmt_amount(sum_amount)
         
-        # Build signature string: MerchantLogin:Sum:InvoiceID:Password1[:extra_params]
-        signature_parts = [merchant_login, amount_str, invoice_id, password]
+        # Extra parameters are signed in alphabetical order
+        extra_items = tuple(sorted(extra_params.items())) if extra_params else ()
         
-        # Add extra parameters if provided (in alphabetical order)
-        if extra_params:
-            sorted_params = sorted(extra_params.items())
-            for key, value in sorted_params:
-                signature_parts.append(f"{key}={value}")
+        # Reuse the pre-encoded login when signing for the configured merchant
+        if merchant_login == self.config.merchant_login:
+            merchant_login_bytes = self.config.merchant_login_bytes
+        else:
+            merchant_login_bytes = merchant_login.encode()
         
-        signature_string = ":".join(signature_parts)
-        signature = hashlib.md5(signature_string.encode()).hexdigest()
+        return self._signature_cache((merchant_login_bytes, amount_str, invoice_id, password, extra_items))
+    
+    def _generate_signature_fast(
+        self,
+        amount_bytes: bytes,
+        invoice_bytes: bytes,
+        password_is_2: bool
+    ) -> str:
+        """
+        Generate MD5 signature for the configured merchant without extra params
         
-        return signature
+        Args:
+            amount_bytes: Encoded formatted payment amount
+            invoice_bytes: Encoded invoice ID
+            password_is_2: Sign with password2 instead of password1
+            
+        Returns:
+            MD5 hash signature
+        """
+        suffix = self._sig_suffix_p2 if password_is_2 else self._sig_suffix_p1
+        return _fast_signature(self._sig_prefix, amount_bytes, invoice_bytes, suffix)
     
     def get_payment_url(
         self,
@@ -113,39 +425,11 @@ class RobokassaPayment:
         Returns:
             Full payment URL
         """
-        # Generate signature
-        signature = self._generate_signature(
-            self.config.merchant_login,
-            amount,
-            invoice_id,
-            self.config.password1,
-            extra_params
-        )
+        extra_items = tuple(sorted(extra_params.items())) if extra_params else ()
         
-        # Build payment parameters
-        params = {
-            'MerchantLogin': self.config.merchant_login,
-            'Sum': f"{amount:.2f}",
-            'InvoiceID': invoice_id,
-            'Description': description,
-            'SignatureValue': signature,
-            'IsTest': '1' if self.config.test_mode else '0',
-        }
-        
-        if email:
-            params['Email'] = email
-        
-        if return_url:
-            params['ReturnURL'] = return_url
-        
-        # Add extra parameters
-        if extra_params:
-            params.update(extra_params)
-        
-        # Build URL
-        payment_url = f"{self.config.base_url}/Merchant/Index?" + urlencode(params)
-        
-        return payment_url
+        return self._build_url(
+            (invoice_id, _fmt_amount(amount), description, email, return_url, extra_items)
+        )
     
     def verify_result_signature(
         self,
@@ -166,15 +450,25 @@ class RobokassaPayment:
         Returns:
             True if signature is valid, False otherwise
         """
-        expected_signature = self._generate_signature(
-            self.config.merchant_login,
-            sum_amount,
-            invoice_id,
-            self.config.password2,
-            extra_params
-        )
+        # MD5 hex digests are always 32 ASCII characters; reject anything else before hashing
+        if len(signature) != 32 or not signature.isascii():
+            return False
+        
+        if extra_params:
+            expected_signature = self._generate_signature(
+                self.config.merchant_login,
+                sum_amount,
+                invoice_id,
+                self.config.password2,
+                extra_params
+            )
+        else:
+            expected_signature = self._generate_signature_fast(
+                _fmt_amount(sum_amount).encode(), invoice_id.encode(), True
+            )
         
-        return signature.lower() == expected_signature.lower()
+        # hexdigest() is already lowercase, only the incoming value needs normalizing
+        return hmac.compare_digest(signature.lower(), expected_signature)
     
     def create_order(
         self,
@@ -216,17 +510,19 @@ class RobokassaPayment:
         if extra_params:
             payload.update(extra_params)
         
+        from requests.exceptions import RequestException
+        
         try:
             # Note: This would require proper API authentication
             # Implementation depends on current Robokassa API
-            response = requests.post(
+            response = self._get_session().post(
                 f"{self.config.api_url}/CreateInvoice",
                 json=payload,
                 timeout=10
             )
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
+        except RequestException as e:
             return {
                 'success': False,
                 'error': str(e)
@@ -242,19 +538,27 @@ class RobokassaPayment:
         Returns:
             Payment status information
         """
+        from requests.exceptions import RequestException
+        
         try:
-            response = requests.get(
+            response = self._get_session().get(
                 f"{self.config.api_url}/GetInvoiceInfo",
                 params={'InvoiceID': invoice_id},
                 timeout=10
             )
             response.raise_for_status()
             return response.json()
-        except requests.RequestException as e:
+        except RequestException as e:
             return {
                 'success': False,
                 'error': str(e)
             }
+    
+    def close(self) -> None:
+        """Close pooled API connections"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 
 class RobokassaNotification:
@@ -3,10 +3,89 @@ Database utility functions for the application.
 """
 
 import sqlite3
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import weakref
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 from contextlib import contextmanager
 
 
+# Pragmas applied to every new connection: WAL journaling with relaxed
+# fsync, in-memory temp storage and a 64 MiB page cache.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+@lru_cache(maxsize=64)
+def _ddl(op: str, table_name: str, schema: str = "") -> str:
+    """Build a CREATE or DROP TABLE statement.
+    
+    Args:
+        op: Either "CREATE" or "DROP".
+        table_name: Table name; must be a plain identifier.
+        schema: SQL schema definition, used for CREATE only.
+        
+    Returns:
+        DDL statement string.
+        
+    Raises:
+        ValueError: If the table name is not a valid identifier.
+    """
+    # Table names cannot be bound as parameters, so reject anything but identifiers
+    if not table_name.isidentifier():
+        raise ValueError(f"Invalid table name: {table_name!r}")
+    if op == "CREATE":
+        return f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})"
+    return f"DROP TABLE IF EXISTS {table_name}"
+
+
+class _ThreadConnection:
+    """Holder for a thread's connection, stored in thread-local storage.
+    
+    The holder is released when its thread exits, which triggers the
+    finalizer that closes the connection. depth counts the thread's open
+    get_connection contexts, so only the outermost one ends the transaction.
+    """
+    
+    __slots__ = ("conn", "depth", "__weakref__")
+    
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 0
+
+
+def _release_connection(conn: sqlite3.Connection, connections: Set[sqlite3.Connection], lock) -> None:
+    """Close a connection and drop it from its owner's registry.
+    
+    Args:
+        conn: Connection to close.
+        connections: Registry of open connections.
+        lock: Lock guarding the registry.
+    """
+    with lock:
+        connections.discard(conn)
+    conn.close()
+
+
+def _close_connections(connections: Set[sqlite3.Connection], lock) -> None:
+    """Close and forget every connection in the registry.
+    
+    Args:
+        connections: Registry of open connections.
+        lock: Lock guarding the registry.
+    """
+    with lock:
+        remaining = list(connections)
+        connections.clear()
+    for conn in remaining:
+        conn.close()
+
+
 class DatabaseConnection:
     """Database connection manager."""
     
@@ -17,24 +96,66 @@ class DatabaseConnection:
             db_path: Path to the SQLite database file.
         """
         self.db_path = db_path
+        self._local = threading.local()
+        # Reentrant, since finalizers may run during garbage collection while it is held
+        self._lock = threading.RLock()
+        self._connections: Set[sqlite3.Connection] = set()
+        # Close any remaining connections on garbage collection or interpreter exit
+        weakref.finalize(self, _close_connections, self._connections, self._lock)
+    
+    def _connect(self) -> _ThreadConnection:
+        """Open and register a connection for the current thread.
+        
+        The connection is closed automatically when the thread exits.
+        
+        Returns:
+            _ThreadConnection: Holder of the new database connection.
+        """
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._lock:
+            self._connections.add(conn)
+        holder = _ThreadConnection(conn)
+        weakref.finalize(holder, _release_connection, conn, self._connections, self._lock)
+        self._local.holder = holder
+        return holder
     
     @contextmanager
     def get_connection(self):
         """Context manager for database connections.
         
+        Each thread keeps one persistent connection, reused across calls so
+        sqlite3's compiled statement cache stays warm. The outermost context
+        commits the transaction on exit, or rolls it back if an exception is
+        raised; nested contexts on the same thread leave it to the outermost.
+        
         Yields:
             sqlite3.Connection: Database connection object.
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            holder = self._connect()
+        conn = holder.conn
+        holder.depth += 1
         try:
             yield conn
-            conn.commit()
+            if holder.depth == 1:
+                conn.commit()
         except Exception as e:
-            conn.rollback()
+            if holder.depth == 1:
+                conn.rollback()
             raise e
         finally:
-            conn.close()
+            holder.depth -= 1
+    
+    def close(self) -> None:
+        """Close all open connections opened by this instance."""
+        with self._lock:
+            # A fresh thread-local makes every thread reconnect on next use
+            self._local = threading.local()
+            _close_connections(self._connections, self._lock)
     
     def execute_query(self, query: str, params: Tuple = ()) -> List[Dict[str, Any]]:
         """Execute a SELECT query and return results.
@@ -46,10 +167,54 @@ class DatabaseConnection:
         Returns:
             List of dictionaries containing query results.
         """
+        return list(self.iter_query(query, params))
+    
+    def execute_query_rows(self, query: str, params: Tuple = ()) -> List[Tuple]:
+        """Execute a SELECT query and return results as plain tuples.
+        
+        Skips building sqlite3.Row and dict objects for every row.
+        
+        Args:
+            query: SQL query string.
+            params: Query parameters for safe execution.
+            
+        Returns:
+            List of tuples containing query results.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = None
             cursor.execute(query, params)
-            return [dict(row) for row in cursor.fetchall()]
+            return cursor.fetchall()
+    
+    def iter_query(self, query: str, params: Tuple = (), batch: int = 1000) -> Iterator[Dict[str, Any]]:
+        """Execute a SELECT query and yield results one row at a time.
+        
+        Rows are fetched from the cursor in batches, so large result sets
+        are never fully materialized.
+        
+        The connection context stays open until the iterator is exhausted or
+        closed; meanwhile other calls on this thread are nested inside it and
+        do not commit. Abandoning the iterator early (e.g. breaking out of a
+        loop) closes the cursor but skips commit/rollback.
+        
+        Args:
+            query: SQL query string.
+            params: Query parameters for safe execution.
+            batch: Number of rows fetched per round trip.
+            
+        Yields:
+            Dictionary for each result row.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.arraysize = batch
+                cursor.execute(query, params)
+                while rows := cursor.fetchmany(batch):
+                    yield from map(dict, rows)
+            finally:
+                cursor.close()
     
     def execute_update(self, query: str, params: Tuple = ()) -> int:
         """Execute an INSERT, UPDATE, or DELETE query.
@@ -66,20 +231,51 @@ class DatabaseConnection:
             cursor.execute(query, params)
             return cursor.rowcount
     
-    def execute_many(self, query: str, params_list: List[Tuple]) -> int:
+    def execute_many(self, query: str, params_list: Iterable[Tuple]) -> int:
         """Execute multiple INSERT, UPDATE, or DELETE queries.
         
         Args:
             query: SQL query string.
-            params_list: List of parameter tuples.
+            params_list: Iterable of parameter tuples.
             
         Returns:
             Total number of rows affected.
         """
+        # Materialize so any iterable works and is written as a single chunk
+        params_list = list(params_list)
+        return self.bulk_insert(query, params_list, chunk_size=max(1, len(params_list)))
+    
+    def bulk_insert(self, query: str, params_iter: Iterable[Tuple], chunk_size: int = 1000) -> int:
+        """Execute a query for many parameter tuples over a single connection.
+        
+        Parameters are consumed in chunks, each written in its own transaction.
+        Inside an enclosing get_connection context, all chunks join the
+        caller's transaction instead.
+        
+        Args:
+            query: SQL query string.
+            params_iter: Iterable of parameter tuples.
+            chunk_size: Number of parameter tuples per transaction.
+            
+        Returns:
+            Total number of rows affected.
+        """
+        total = 0
+        params_iter = iter(params_iter)
         with self.get_connection() as conn:
+            outermost = self._local.holder.depth == 1
             cursor = conn.cursor()
-            cursor.executemany(query, params_list)
-            return cursor.rowcount
+            while True:
+                chunk = list(islice(params_iter, chunk_size))
+                if not chunk:
+                    break
+                if outermost and not conn.in_transaction:
+                    cursor.execute("BEGIN")
+                cursor.executemany(query, chunk)
+                if outermost:
+                    conn.commit()
+                total += cursor.rowcount
+        return total
     
     def create_table(self, table_name: str, schema: str) -> None:
         """Create a table if it doesn't exist.
@@ -87,8 +283,11 @@ class DatabaseConnection:
         Args:
             table_name: Name of the table to create.
             schema: SQL schema definition for the table.
+            
+        Raises:
+            ValueError: If the table name is not a valid identifier.
         """
-        query = f"CREATE TABLE IF NOT EXISTS {table_name} ({schema})"
+        query = _ddl("CREATE", table_name, schema)
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query)
@@ -98,8 +297,11 @@ class DatabaseConnection:
         
         Args:
             table_name: Name of the table to drop.
+            
+        Raises:
+            ValueError: If the table name is not a valid identifier.
         """
-        query = f"DROP TABLE IF EXISTS {table_name}"
+        query = _ddl("DROP", table_name)
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query)